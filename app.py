@@ -1,20 +1,110 @@
+import io
 import os
+import shutil
+import tempfile
 import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 from tkinter import font as tkfont
-from pygments import highlight
-from pygments.lexers import get_lexer_for_filename, TextLexer
+from pygments.lexers import (get_all_lexers, get_lexer_for_filename, TextLexer, PythonLexer, JavascriptLexer,
+                             TypeScriptLexer, JavaLexer, CLexer, CppLexer, GoLexer, RustLexer,
+                             HtmlLexer, CssLexer, JsonLexer, YamlLexer, BashLexer, MarkdownLexer)
 from pygments.formatters import HtmlFormatter
-from weasyprint import HTML
+from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
 import sv_ttk  # For theming
+try:
+    import pymupdf  # PyMuPDF, optional: enables the "Fast PDF" mode
+except ImportError:
+    pymupdf = None
 import queue  # For thread-safe communication
+import itertools
 import logging
-
-# Configure logging to output to 'codetopdf.log' with debug level
-logging.basicConfig(level=logging.DEBUG, filename='codetopdf.log',
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+
+# Logging output to 'codetopdf.log' (configured in main); set LOG_LEVEL to logging.DEBUG to trace
+# every scanned item and checkbox change
+LOG_FILE = 'codetopdf.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_LEVEL = logging.INFO
+
+logger = logging.getLogger(__name__)
+
+# Custom CSS for line wrapping and page margins
+CUSTOM_CSS = '''
+@page {
+    size: A4;
+    margin: 1cm;
+}
+pre, code {
+    white-space: pre-wrap;       /* Wrap long lines */
+    word-wrap: break-word;       /* Break words if necessary */
+    word-break: break-all;       /* Break long words/chunks */
+}
+section.source-file + section.source-file {
+    page-break-before: always;   /* Start each file of a batch on a new page */
+}
+'''
+
+# Source code and text file types listed in the Treeview (unless "Show all files" is enabled)
+TEXT_EXTS = frozenset({
+    '.py', '.pyi', '.pyx', '.ipynb', '.txt', '.md', '.rst', '.java', '.kt', '.kts', '.scala',
+    '.groovy', '.gradle', '.c', '.h', '.cpp', '.cc', '.cxx', '.hpp', '.hh', '.hxx', '.cs', '.m',
+    '.mm', '.swift', '.go', '.rs', '.js', '.jsx', '.mjs', '.cjs', '.ts', '.tsx', '.vue',
+    '.svelte', '.html', '.htm', '.css', '.scss', '.sass', '.less', '.json', '.xml', '.yml',
+    '.yaml', '.toml', '.ini', '.cfg', '.conf', '.env', '.sh', '.bash', '.zsh', '.fish', '.ps1',
+    '.bat', '.cmd', '.rb', '.php', '.pl', '.pm', '.lua', '.r', '.jl', '.hs', '.ex', '.exs',
+    '.erl', '.clj', '.dart', '.sql', '.graphql', '.proto', '.cmake', '.mk', '.tex', '.csv',
+})
+TEXT_FILENAMES = frozenset({
+    'makefile', 'dockerfile', 'gemfile', 'rakefile', 'procfile', 'license', 'readme',
+    '.gitignore', '.gitattributes', '.dockerignore', '.editorconfig',
+})
+
+# Checkbox prefix shown in the Treeview for each check state
+CHECK_PREFIX = {'checked': "☑ ", 'unchecked': "☐ ", 'partial': "☒ "}
+
+# Maximum number of folders scanned concurrently
+SCAN_WORKERS = 8
+
+# ProcessPoolExecutor refuses more than 61 workers on Windows
+MAX_WORKERS = 61
+
+# Number of files rendered together in a single WeasyPrint document
+PDF_BATCH_SIZE = 20
+
+# Maximum number of WeasyPrint layouts held in memory at once across all workers
+MAX_CONCURRENT_RENDERS = 3
+
+# Documents built from more source text than this (in bytes) are spooled to a temporary file
+HTML_SPOOL_THRESHOLD = 8 * 1024 * 1024
+
+# WeasyPrint state shared by all conversions in a process, created by the first render
+_FONT_CONFIG = None
+_STYLESHEET = None
+_RENDER_SLOTS = nullcontext()  # Semaphore shared by the worker pool
+_CANCEL_EVENT = None  # Set when the conversion run this worker belongs to is stopped
+
+# Multiprocessing context for the conversion workers and the primitives they share. Workers are
+# always spawned: forking a process that runs Tk and background threads is unsafe, and spawn is
+# what Windows and macOS use anyway
+_MP_CONTEXT = multiprocessing.get_context('spawn')
+
+# Fast PDF layout: monospaced text on A4 pages with 1cm margins
+FAST_PDF_FONT_SIZE = 8
+FAST_PDF_MARGIN = 28.35  # 1cm in points
+
+# Shared Pygments formatter; the page CSS and style definitions are generated once
+_FORMATTER = HtmlFormatter(style='colorful')
+_PAGE_CSS = CUSTOM_CSS + _FORMATTER.get_style_defs('.highlight')
+_HTML_HEAD = '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n</head>\n<body>\n'
+_HTML_TAIL = '</body>\n</html>\n'
 
 
 class CodebaseConverterApp:
@@ -27,11 +117,29 @@ class CodebaseConverterApp:
         # Initialize variables
         self.root_dir = None  # Source directory
         self.dest_dir = None  # Destination directory
-        self.stop_event = threading.Event()  # Event to signal stopping conversion
+        self.success_count = 0  # Conversion results reported so far
+        self.fail_count = 0
+        self.scan_cancel = threading.Event()  # Set to stop the scans of the current tree
+        self.scan_jobs = queue.Queue()  # (scan method, args) pairs run by the scan threads
+        self.conversion_pool = None  # Worker pool of the latest conversion run
+        self.conversion_futures = {}  # Batches submitted to conversion_pool
+        self.conversion_cancel = None  # Stop event of the latest conversion run
 
         # Initialize queues for thread-safe communication
         self.tree_queue = queue.Queue()
         self.gui_queue = queue.Queue()
+        self.tree_queue_pending = threading.Event()  # A <<TreeQueueNew>> event is already posted
+        self.gui_queue_pending = threading.Event()  # A <<GuiQueueNew>> event is already posted
+
+        # Folder scans share a fixed set of daemon threads, so a blocked scan never holds up exit
+        for _ in range(SCAN_WORKERS):
+            threading.Thread(target=self.run_scan_jobs, daemon=True).start()
+
+        # Checkbox state cache, kept in sync with the Treeview to avoid parsing item text
+        self.check_state = {}  # item -> 'checked', 'unchecked' or 'partial'
+        self.child_counts = {}  # item -> [checked or partial children, checkbox children]
+        self.file_paths = {}  # file item -> absolute path
+        self.scan_ids = itertools.count(1)  # Item ids assigned by scan_tree_bulk
 
         # Apply theme using sv_ttk
         sv_ttk.set_theme("light")  # Options: "light", "dark", etc.
@@ -47,9 +155,16 @@ class CodebaseConverterApp:
         self.create_log_area()
         self.create_status_bar()
 
-        # Start processing queues
-        self.root.after(100, self.process_tree_queue)
-        self.root.after(100, self.process_gui_queue)
+        # Drain the queues as soon as producers post new items
+        self.root.bind('<<TreeQueueNew>>', self.drain_tree_queue)
+        self.root.bind('<<GuiQueueNew>>', self.drain_gui_queue)
+
+        # Start polling queues as a fallback
+        self.root.after(1000, self.process_tree_queue)
+        self.root.after(1000, self.process_gui_queue)
+
+        # Stop background scans when the window is closed
+        self.root.protocol('WM_DELETE_WINDOW', self.exit_app)
 
     def configure_fonts(self):
         """Configure default and Treeview fonts."""
@@ -68,7 +183,7 @@ class CodebaseConverterApp:
         file_menu.add_command(label="Select Source Folder", command=self.select_folder)
         file_menu.add_command(label="Restart", command=self.restart_app)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.exit_app)
 
         # Help Menu
         help_menu = tk.Menu(menu_bar, tearoff=0)
@@ -138,6 +253,27 @@ class CodebaseConverterApp:
         self.txt_checkbox = ttk.Checkbutton(self.format_frame, text="TXT", variable=self.txt_var)
         self.txt_checkbox.pack(side=tk.LEFT, padx=5)
 
+        # Fast PDF mode draws the text directly with PyMuPDF (only available if it is installed)
+        self.fast_pdf_var = tk.BooleanVar(value=False)
+        self.fast_pdf_checkbox = ttk.Checkbutton(self.format_frame, text="Fast PDF", variable=self.fast_pdf_var)
+        self.fast_pdf_checkbox.pack(side=tk.LEFT, padx=5)
+        if pymupdf is None:
+            self.fast_pdf_checkbox.config(state=tk.DISABLED)
+
+        # Scan option: list every file instead of only code/text files
+        self.show_all_var = tk.BooleanVar(value=False)
+        self.show_all_files = False  # Plain copy of show_all_var, read by scan threads
+        self.show_all_checkbox = ttk.Checkbutton(self.format_frame, text="Show all files",
+                                                 variable=self.show_all_var,
+                                                 command=self.on_show_all_toggled)
+        self.show_all_checkbox.pack(side=tk.LEFT, padx=5)
+
+        # Scan option: load the whole folder tree up front instead of on expansion
+        self.prescan_var = tk.BooleanVar(value=False)
+        self.prescan_checkbox = ttk.Checkbutton(self.format_frame, text="Pre-scan whole tree",
+                                                variable=self.prescan_var)
+        self.prescan_checkbox.pack(side=tk.LEFT, padx=5)
+
         # Buttons
         self.select_button = ttk.Button(self.buttons_frame, text="Select Source Folder",
                                         command=self.select_folder)
@@ -165,6 +301,10 @@ class CodebaseConverterApp:
         self.progress_bar = ttk.Progressbar(self.progress_frame, orient='horizontal', mode='determinate')
         self.progress_bar.pack(fill=tk.X, expand=True)
 
+    def on_show_all_toggled(self):
+        """Apply the "Show all files" option to folders expanded from now on."""
+        self.show_all_files = self.show_all_var.get()
+
     def create_log_area(self):
         """Create the log area to display conversion logs."""
         self.log_frame = ttk.LabelFrame(self.root, text="Conversion Log")
@@ -177,6 +317,12 @@ class CodebaseConverterApp:
         self.status_bar = ttk.Label(self.root, text="Ready", relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+    def exit_app(self):
+        """Stop background scans and conversions and close the application."""
+        self.scan_cancel.set()  # Running and queued scans stop at their next entry
+        self.cancel_conversion()
+        self.root.destroy()
+
     def about_app(self):
         """Display information about the application."""
         messagebox.showinfo("About",
@@ -199,17 +345,48 @@ class CodebaseConverterApp:
     def populate_treeview(self):
         """Populate the Treeview with the root directory."""
         # Clear existing Treeview
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
 
         root_name = os.path.basename(self.root_dir)
         if not root_name:
             root_name = self.root_dir  # Handle case when selecting root directory
 
-        # Insert root node with a dummy child for lazy loading
         root_node = self.tree.insert('', 'end', text=f"☐ {root_name}", values=[self.root_dir], tags=('unchecked',))
-        self.tree.insert(root_node, 'end', text='Loading...', values=[''], tags=('dummy',))
+        self.register_tree_item(root_node, '')
 
-        logging.debug(f"Populated Treeview with root node: {self.root_dir}")
+        if self.prescan_var.get():
+            # Load the whole tree in the background
+            self.scan_jobs.put((self.scan_tree_bulk, (self.root_dir, root_node, self.scan_cancel)))
+        else:
+            # Add a dummy child for lazy loading
+            self.tree.insert(root_node, 'end', text='Loading...', values=[''], tags=('dummy',))
+
+        logger.debug(f"Populated Treeview with root node: {self.root_dir}")
+
+    def clear_tree(self):
+        """Remove all Treeview items along with their cached checkbox state."""
+        # Stop scans of the old tree; scans of the new tree get a fresh event
+        self.scan_cancel.set()
+        self.scan_cancel = threading.Event()
+        self.tree.delete(*self.tree.get_children())
+        self.check_state.clear()
+        self.child_counts.clear()
+        self.file_paths.clear()
+
+    def register_tree_item(self, item, parent, filepath=None):
+        """Record a newly inserted (unchecked) checkbox item in the state cache."""
+        self.check_state[item] = 'unchecked'
+        self.child_counts[item] = [0, 0]
+        if parent in self.child_counts:
+            self.child_counts[parent][1] += 1
+        if filepath is not None:
+            self.file_paths[item] = filepath
+
+    def set_check_state(self, item, new_tag):
+        """Set the checkbox state of a single item, updating its text prefix and tags together."""
+        text = self.tree.item(item, 'text')
+        self.tree.item(item, text=CHECK_PREFIX[new_tag] + text[2:], tags=(new_tag,))
+        self.check_state[item] = new_tag
 
     def on_treeview_open(self, event):
         """Handle the expansion of a Treeview node."""
@@ -223,16 +400,10 @@ class CodebaseConverterApp:
             abspath = self.tree.item(node, 'values')[0]
 
             # Log the expansion attempt
-            logging.debug(f"Expanding node: {abspath}")
+            logger.debug(f"Expanding node: {abspath}")
 
-            # Start a background thread to scan and enqueue children
-            try:
-                threading.Thread(target=self.scan_and_enqueue_children,
-                                 args=(abspath, node),
-                                 daemon=True).start()
-            except Exception as e:
-                logging.error(f"Error starting scan thread: {e}")
-                self.gui_queue.put(('log', f"Error starting scan thread: {e}\n"))
+            # Scan and enqueue children on the shared scan threads
+            self.scan_jobs.put((self.scan_and_enqueue_children, (abspath, node, self.scan_cancel)))
 
     def on_treeview_click(self, event):
         """
@@ -253,117 +424,83 @@ class CodebaseConverterApp:
         if not item:
             return
 
-        # Get the current text
-        current_text = self.tree.item(item, 'text')
-        if current_text.startswith("☐ "):
-            new_state = "☑ "
-            new_tag = 'checked'
-        elif current_text.startswith("☑ "):
-            new_state = "☐ "
-            new_tag = 'unchecked'
-        elif current_text.startswith("☒ "):
-            new_state = "☑ "
-            new_tag = 'checked'
-        else:
+        current_tag = self.check_state.get(item)
+        if current_tag is None:
             return  # Not a checkbox item
+        new_tag = 'unchecked' if current_tag == 'checked' else 'checked'
 
-        # Update the text
-        self.tree.item(item, text=new_state + current_text[2:])
-
-        # Update the tags
-        self.tree.item(item, tags=(new_tag,))
+        # Update the text and tags
+        self.set_check_state(item, new_tag)
 
         # Log the checkbox state change
-        logging.debug(f"Checkbox toggled: {current_text} -> {new_state + current_text[2:]} for item {item}")
+        logger.debug(f"Checkbox toggled: {current_tag} -> {new_tag} for item {item}")
 
         # Update children and parents accordingly
         self.update_children(item, new_tag)
-        self.update_parent_check(item)
+        self.update_parent_check(item, current_tag, new_tag)
 
     def update_children(self, parent, new_tag):
         """
-        Recursively update the checkbox state of all child items.
+        Update the checkbox state of all descendants of an item.
+        Walks the subtree with an explicit stack, so deep folders cannot hit the recursion limit.
         """
-        for child in self.tree.get_children(parent):
-            # Update checkbox state
-            text = self.tree.item(child, 'text')
-            if text.startswith("☐ ") or text.startswith("☑ ") or text.startswith("☒ "):
-                current_text = self.tree.item(child, 'text')
-                if new_tag == 'checked':
-                    new_text = "☑ " + current_text[2:]
-                elif new_tag == 'unchecked':
-                    new_text = "☐ " + current_text[2:]
-                self.tree.item(child, text=new_text)
-                self.tree.item(child, tags=(new_tag,))
-
-                # Log the recursive update
-                logging.debug(f"Updating child {child}: {current_text} -> {new_text}")
-
-                # Recursive update for subchildren
-                self.update_children(child, new_tag)
-
-    def update_parent_check(self, child):
+        debug = logger.isEnabledFor(logging.DEBUG)
+        stack = deque([parent])
+        while stack:
+            item = stack.pop()
+            counts = self.child_counts[item]
+            counts[0] = counts[1] if new_tag == 'checked' else 0
+            for child in self.tree.get_children(item):
+                if child in self.check_state:
+                    self.set_check_state(child, new_tag)
+
+                    # Log the update
+                    if debug:
+                        logger.debug(f"Updating child {child} -> {new_tag}")
+
+                    # Visit subchildren later
+                    stack.append(child)
+
+    def update_parent_check(self, child, old_tag, new_tag):
         """
-        Recursively update the checkbox state of parent items based on their children's states.
+        Update the checkbox state of parent items after a child changed from old_tag to new_tag.
+        Each parent keeps a count of its checked children, so only the affected ancestors are visited.
         """
-        parent = self.tree.parent(child)
-        if not parent:
-            return
+        while True:
+            parent = self.tree.parent(child)
+            if parent not in self.child_counts:
+                return
 
-        children = self.tree.get_children(parent)
-        checked = 0
-        unchecked = 0
-        for c in children:
-            text = self.tree.item(c, 'text')
-            if text.startswith("☑ ") or text.startswith("☒ "):
-                checked += 1
-            elif text.startswith("☐ "):
-                unchecked += 1
-
-        if checked == len(children):
-            new_state = "☑ "
-            new_tag = 'checked'
-        elif unchecked == len(children):
-            new_state = "☐ "
-            new_tag = 'unchecked'
-        else:
-            new_state = "☒ "
-            new_tag = 'partial'
+            counts = self.child_counts[parent]
+            counts[0] += (new_tag != 'unchecked') - (old_tag != 'unchecked')
+            checked, total = counts
+            if checked == total:
+                parent_tag = 'checked'
+            elif checked == 0:
+                parent_tag = 'unchecked'
+            else:
+                parent_tag = 'partial'
+
+            old_parent_tag = self.check_state[parent]
+            if parent_tag == old_parent_tag:
+                return  # Higher-level parents are unaffected
 
-        current_text = self.tree.item(parent, 'text')
-        new_text = new_state + current_text[2:]
-        self.tree.item(parent, text=new_text)
-        self.tree.item(parent, tags=(new_tag,))
+            self.set_check_state(parent, parent_tag)
 
-        # Log the parent update
-        logging.debug(f"Updating parent {parent}: {current_text} -> {new_text}")
+            # Log the parent update
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Updating parent {parent}: {old_parent_tag} -> {parent_tag}")
 
-        # Recursive update for higher-level parents
-        self.update_parent_check(parent)
+            child, old_tag, new_tag = parent, old_parent_tag, parent_tag
 
     def get_checked_items(self):
         """
         Retrieve all checked files only.
         Ignore the checked state of directories.
         """
-        checked_items = []
-
-        def recurse(item):
-            tags = self.tree.item(item, 'tags')
-            values = self.tree.item(item, 'values')
-            if not values or len(values) < 1:
-                return
-            abspath = values[0]
-            if 'checked' in tags and os.path.isfile(abspath):
-                if not abspath.endswith('.pdf'):  # Exclude already converted PDFs
-                    checked_items.append(abspath)
-            # Recurse into children regardless of parent check state
-            for child in self.tree.get_children(item):
-                recurse(child)
-
-        for child in self.tree.get_children():
-            recurse(child)
-        return checked_items
+        return [filepath for item, filepath in self.file_paths.items()
+                if self.check_state[item] == 'checked'
+                and not filepath.endswith('.pdf')]  # Exclude already converted PDFs
 
     def lock_selection(self):
         """Lock the current selection to prevent further changes and enable conversion."""
@@ -417,150 +554,258 @@ class CodebaseConverterApp:
         self.log_area.config(state='normal')
         self.log_area.delete(1.0, tk.END)
         self.log_area.config(state='disabled')
+        self.success_count = 0
+        self.fail_count = 0
         self.stats_labels['success'].config(text="Successfully Converted: 0")
         self.stats_labels['fail'].config(text="Failed Conversions: 0")
         self.progress_bar['maximum'] = len(selected_items)
         self.progress_bar['value'] = 0
 
-        # Clear stop event
-        self.stop_event.clear()
+        # Give each run its own stop event (shared with its worker processes), so a stopped run
+        # that is still winding down never sees the event of the run that replaced it
+        stop_event = _MP_CONTEXT.Event()
+        self.conversion_cancel = stop_event
 
         # Start conversion in a separate thread
         conversion_thread = threading.Thread(target=self.run_conversion,
-                                             args=(selected_items, dest_dir),
+                                             args=(selected_items, dest_dir, stop_event),
                                              daemon=True)
         conversion_thread.start()
 
-    def run_conversion(self, selected_items, dest_dir):
+    def run_conversion(self, selected_items, dest_dir, stop_event):
         """
         Convert selected files to PDF and/or TXT formats.
-        Runs in a separate thread to keep the GUI responsive.
+        Runs in a separate thread to keep the GUI responsive; stops once stop_event is set.
         """
-        success_count = 0
-        fail_count = 0
-        total_files = len(selected_items)
-
-        for idx, source_file in enumerate(selected_items, 1):
-            if self.stop_event.is_set():
-                self.gui_queue.put(('log', "Conversion stopped by user.\n"))
-                break
-
+        # Determine output formats
+        formats = []
+        if self.pdf_var.get():
+            formats.append('pdf')
+        if self.txt_var.get():
+            formats.append('txt')
+
+        if not formats:
+            formats.append('pdf')  # Default to PDF if no selection
+        fast_pdf = pymupdf is not None and self.fast_pdf_var.get()
+
+        # Precompute each file's destination path (without extension)
+        jobs = []
+        for source_file in selected_items:
             if os.path.isdir(source_file):
                 continue  # Skip directories
+            relative_path = os.path.relpath(source_file, self.root_dir)
+            jobs.append((source_file, os.path.join(dest_dir, os.path.splitext(relative_path)[0])))
 
-            # Determine output formats
-            formats = []
-            if self.pdf_var.get():
-                formats.append('pdf')
-            if self.txt_var.get():
-                formats.append('txt')
-
-            if not formats:
-                formats.append('pdf')  # Default to PDF if no selection
+        # Create every destination directory once up front instead of once per file and format
+        for job_dir in {os.path.dirname(dest_base) for _, dest_base in jobs}:
+            try:
+                os.makedirs(job_dir, exist_ok=True)
+            except Exception as e:
+                # Files in this directory will report their own write errors
+                self.enqueue_gui(('log', f"Failed to create directory {job_dir}: {e}\n"))
+
+        # Group files into batches so each worker renders several files per WeasyPrint call,
+        # while keeping enough batches to occupy every worker on small selections
+        workers = min(os.cpu_count() or 1, MAX_WORKERS)
+        batch_size = max(1, min(PDF_BATCH_SIZE, -(-len(jobs) // workers)))
+        batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+
+        # Convert batches in worker processes; results are reported as they complete
+        render_slots = _MP_CONTEXT.Semaphore(min(MAX_CONCURRENT_RENDERS, workers))
+        executor = None
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT, initializer=_init_worker,
+                                           initargs=(render_slots, stop_event))
+            futures = {executor.submit(_convert_batch, batch, formats, fast_pdf): batch
+                       for batch in batches}
+        except Exception as e:
+            logger.error(f"Failed to start conversion workers: {e}")
+            self.enqueue_gui(('log', f"Failed to start conversion workers: {e}\n"))
+            self.enqueue_gui(('buttons', 'enable'))
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            return
 
-            if 'pdf' in formats:
-                try:
-                    relative_path = os.path.relpath(source_file, self.root_dir)
-                    dest_pdf = os.path.join(dest_dir, os.path.splitext(relative_path)[0] + '.pdf')
-                    dest_pdf_dir = os.path.dirname(dest_pdf)
-                    os.makedirs(dest_pdf_dir, exist_ok=True)  # Create directories if they don't exist
-                    self.convert_code_to_pdf(source_file, dest_pdf)
-                    success_count += 1
-                    self.gui_queue.put(('success', success_count))
-                    self.gui_queue.put(('log', f"Converted to PDF: {dest_pdf}\n"))
-                except Exception as e:
-                    fail_count += 1
-                    self.gui_queue.put(('fail', fail_count))
-                    self.gui_queue.put(('log', f"Failed to convert {source_file} to PDF: {e}\n"))
+        # Keep the pool reachable so stop_conversion and exit_app can cancel it
+        self.conversion_pool = executor
+        self.conversion_futures = futures
+        try:
+            for future in as_completed(futures):
+                if stop_event.is_set():
+                    break  # stop_conversion has already logged the stop and reset the buttons
 
-            if 'txt' in formats:
                 try:
-                    relative_path = os.path.relpath(source_file, self.root_dir)
-                    dest_txt = os.path.join(dest_dir, os.path.splitext(relative_path)[0] + '.txt')
-                    dest_txt_dir = os.path.dirname(dest_txt)
-                    os.makedirs(dest_txt_dir, exist_ok=True)  # Create directories if they don't exist
-                    with open(source_file, 'r', encoding='utf-8') as f_src, open(dest_txt, 'w', encoding='utf-8') as f_dest:
-                        f_dest.write(f_src.read())
-                    success_count += 1
-                    self.gui_queue.put(('success', success_count))
-                    self.gui_queue.put(('log', f"Converted to TXT: {dest_txt}\n"))
-                except UnicodeDecodeError as e:
-                    fail_count += 1
-                    self.gui_queue.put(('fail', fail_count))
-                    self.gui_queue.put(('log', f"Failed to convert {source_file} to TXT (Unicode Decode Error): {e}\n"))
+                    results = future.result()
                 except Exception as e:
-                    fail_count += 1
-                    self.gui_queue.put(('fail', fail_count))
-                    self.gui_queue.put(('log', f"Failed to convert {source_file} to TXT: {e}\n"))
-
-            # Update progress bar
-            self.gui_queue.put(('progress', 1))
-
-        # Final messages and button states
-        if not self.stop_event.is_set():
-            self.gui_queue.put(('message', "All files have been converted.", "info"))
-
-        # Re-enable buttons
-        self.gui_queue.put(('buttons', 'enable'))
+                    # The worker process itself failed (e.g. it was killed)
+                    failed = False if 'pdf' in formats else None, False if 'txt' in formats else None
+                    results = [(source_file, *failed, [f"Conversion worker failed for {source_file}: {e}\n"])
+                               for source_file, _ in futures[future]]
+
+                # Report the whole batch with a single task
+                self.enqueue_gui(('results', results))
+        finally:
+            # Drop any batches that have not started yet (only relevant when stopped)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Final messages and button states; a stopped run posts nothing, as a new run may have started
+        if not stop_event.is_set():
+            self.enqueue_gui(('message', "All files have been converted.", "info"))
+            self.enqueue_gui(('buttons', 'enable'))
 
     def stop_conversion(self):
         """Signal the conversion thread to stop."""
-        self.stop_event.set()
+        self.cancel_conversion()
         self.stop_button.config(state=tk.DISABLED)
         self.start_button.config(state=tk.DISABLED)
         self.lock_button.config(state=tk.DISABLED)
         self.select_button.config(state=tk.NORMAL)
-        self.gui_queue.put(('log', "The conversion process has been stopped by the user.\n"))
+        self.enqueue_gui(('log', "The conversion process has been stopped by the user.\n"))
+
+    def cancel_conversion(self):
+        """
+        Stop the latest conversion run.
+        Batches that have not started are cancelled; running batches stop at their next file.
+        """
+        if self.conversion_cancel is not None:
+            self.conversion_cancel.set()
+        if self.conversion_pool is not None:
+            for future in self.conversion_futures:
+                future.cancel()
+            self.conversion_pool.shutdown(wait=False, cancel_futures=True)
+
+    def enqueue_tree(self, item):
+        """Put an item on the tree_queue and wake the GUI thread to insert it."""
+        self.tree_queue.put(item)
+        self.notify_queue('<<TreeQueueNew>>', self.tree_queue_pending)
+
+    def enqueue_gui(self, task):
+        """Put a task on the gui_queue and wake the GUI thread to apply it."""
+        self.gui_queue.put(task)
+        self.notify_queue('<<GuiQueueNew>>', self.gui_queue_pending)
+
+    def notify_queue(self, sequence, pending):
+        """Post a virtual event to the GUI thread, unless one is already pending for the queue."""
+        if pending.is_set():
+            return
+        pending.set()
+        try:
+            self.root.event_generate(sequence, when='tail')
+        except (tk.TclError, RuntimeError):
+            # The window is closing; the fallback poll picks the item up if it is still running
+            pending.clear()
 
     def process_tree_queue(self):
         """
-        Process items from the tree_queue and insert them into the Treeview.
+        Fallback poll of the tree_queue in case a wake-up event was missed.
         Runs periodically using the Tkinter 'after' method.
         """
+        self.drain_tree_queue()
+        self.root.after(1000, self.process_tree_queue)
+
+    def drain_tree_queue(self, event=None):
+        """
+        Process items from the tree_queue and insert them into the Treeview.
+        Triggered by the <<TreeQueueNew>> event posted by the scan threads.
+        """
+        self.tree_queue_pending.clear()
+        items = []
         try:
             while True:
-                item = self.tree_queue.get_nowait()
-                if item[0] == 'directory':
-                    _, dirpath, _, parent = item
+                items.append(self.tree_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if items:
+            # Group items by parent so each parent is re-laid out only once
+            groups = {}
+            for item in items:
+                groups.setdefault(item[3], []).append(item)
+            for parent, group in groups.items():
+                try:
+                    self.insert_tree_items(parent, group)
+                except Exception as e:
+                    logger.error(f"Error processing tree queue: {e}")
+                    self.enqueue_gui(('log', f"Error processing tree queue: {e}\n"))
+
+    def insert_tree_items(self, parent, items):
+        """
+        Insert a group of scanned items under the same parent node.
+        The parent is detached during the inserts so the Treeview lays it out only once.
+        """
+        if not self.tree.exists(parent):
+            return  # Parent was removed, e.g. the tree was reset while scanning
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        grandparent = self.tree.parent(parent)
+        index = self.tree.index(parent)
+        self.tree.detach(parent)
+        try:
+            for kind, path, iid, _ in items:
+                if kind == 'directory':
                     # Insert directory with a dummy child
-                    node = self.tree.insert(parent, 'end', text=f"☐ {os.path.basename(dirpath)}",
-                                            values=[dirpath], tags=('unchecked',))
+                    node = self.tree.insert(parent, 'end', text=f"☐ {os.path.basename(path)}",
+                                            values=[path], tags=('unchecked',))
                     self.tree.insert(node, 'end', text='Loading...', values=[''], tags=('dummy',))
-                    logging.debug(f"Inserted directory node: {dirpath}")
-                elif item[0] == 'file':
-                    _, filepath, _, parent = item
+                    self.register_tree_item(node, parent)
+                    if debug:
+                        logger.debug(f"Inserted directory node: {path}")
+                elif kind == 'scanned_directory':
+                    # Insert directory whose children are already queued (no dummy needed)
+                    node = self.tree.insert(parent, 'end', iid=iid, text=f"☐ {os.path.basename(path)}",
+                                            values=[path], tags=('unchecked',))
+                    self.register_tree_item(node, parent)
+                    if debug:
+                        logger.debug(f"Inserted scanned directory node: {path}")
+                elif kind == 'file':
                     # Insert file without children
-                    self.tree.insert(parent, 'end', text=f"☐ {os.path.basename(filepath)}",
-                                    values=[filepath], tags=('unchecked',))
-                    logging.debug(f"Inserted file node: {filepath}")
-        except queue.Empty:
-            pass
-        except Exception as e:
-            logging.error(f"Error processing tree queue: {e}")
-            self.gui_queue.put(('log', f"Error processing tree queue: {e}\n"))
-        self.root.after(100, self.process_tree_queue)  # Adjust the delay as needed
+                    node = self.tree.insert(parent, 'end', text=f"☐ {os.path.basename(path)}",
+                                            values=[path], tags=('unchecked',))
+                    self.register_tree_item(node, parent, filepath=path)
+                    if debug:
+                        logger.debug(f"Inserted file node: {path}")
+        finally:
+            self.tree.reattach(parent, grandparent, index)
 
     def process_gui_queue(self):
         """
-        Process tasks from the gui_queue and update the GUI accordingly.
+        Fallback poll of the gui_queue in case a wake-up event was missed.
         Runs periodically using the Tkinter 'after' method.
         """
+        self.drain_gui_queue()
+        self.root.after(1000, self.process_gui_queue)
+
+    def drain_gui_queue(self, event=None):
+        """
+        Process tasks from the gui_queue and update the GUI accordingly.
+        Triggered by the <<GuiQueueNew>> event posted by the worker threads.
+        All tasks drained at once are applied to the widgets in a single update.
+        """
+        self.gui_queue_pending.clear()
+        log_buf = []
+        successes = 0
+        failures = 0
+        progress = 0
+        status_messages = []
         try:
             while True:
                 task = self.gui_queue.get_nowait()
-                if task[0] == 'success':
-                    self.stats_labels['success'].config(text=f"Successfully Converted: {task[1]}")
-                elif task[0] == 'fail':
-                    self.stats_labels['fail'].config(text=f"Failed Conversions: {task[1]}")
+                if task[0] == 'results':
+                    # (source_file, ok_pdf, ok_txt, messages) for each converted file
+                    for _, ok_pdf, ok_txt, messages in task[1]:
+                        for ok in (ok_pdf, ok_txt):
+                            if ok is True:
+                                successes += 1
+                            elif ok is False:
+                                failures += 1
+                        log_buf.extend(messages)
+                        progress += 1
                 elif task[0] == 'log':
-                    self.log_area.config(state='normal')
-                    self.log_area.insert(tk.END, task[1])
-                    self.log_area.see(tk.END)
-                    self.log_area.config(state='disabled')
-                elif task[0] == 'progress':
-                    self.progress_bar.step(task[1])
+                    log_buf.append(task[1])
                 elif task[0] == 'message':
-                    messagebox.showinfo("Conversion Status", task[1])
+                    status_messages.append(task[1])  # Shown after the widgets are updated
                 elif task[0] == 'buttons':
                     if task[1] == 'enable':
                         self.start_button.config(state=tk.DISABLED)
@@ -569,51 +814,121 @@ class CodebaseConverterApp:
         except queue.Empty:
             pass
         except Exception as e:
-            logging.error(f"Error processing GUI queue: {e}")
+            logger.error(f"Error processing GUI queue: {e}")
+            log_buf.append(f"Error processing GUI queue: {e}\n")
+
+        if log_buf:
             self.log_area.config(state='normal')
-            self.log_area.insert(tk.END, f"Error processing GUI queue: {e}\n")
+            self.log_area.insert(tk.END, ''.join(log_buf))
+            self.log_area.see(tk.END)
             self.log_area.config(state='disabled')
-        self.root.after(100, self.process_gui_queue)
+        if successes:
+            self.success_count += successes
+            self.stats_labels['success'].config(text=f"Successfully Converted: {self.success_count}")
+        if failures:
+            self.fail_count += failures
+            self.stats_labels['fail'].config(text=f"Failed Conversions: {self.fail_count}")
+        if progress:
+            self.progress_bar['value'] += progress
+        for message in status_messages:
+            messagebox.showinfo("Conversion Status", message)
+
+    def run_scan_jobs(self):
+        """
+        Run queued folder scans one after another.
+        Runs in each of the SCAN_WORKERS scan threads for the lifetime of the application.
+        """
+        while True:
+            scan, args = self.scan_jobs.get()
+            try:
+                scan(*args)
+            except Exception as e:
+                logger.error(f"Error in scan thread: {e}")
 
-    def scan_and_enqueue_children(self, abspath, parent_node):
+    def scan_and_enqueue_children(self, abspath, parent_node, cancel):
         """
         Scan a directory and enqueue its subdirectories and all files.
-        Runs in a separate thread.
+        Runs in a separate thread and stops once cancel is set.
         """
         enqueued = False  # Flag to check if any items are enqueued
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
             with os.scandir(abspath) as it:
                 entries = sorted(it, key=lambda e: e.name.lower())
                 for entry in entries:
-                    if self.stop_event.is_set():
-                        logging.debug(f"Scanning stopped for: {abspath}")
-                        break
+                    if cancel.is_set():
+                        logger.debug(f"Scanning stopped for: {abspath}")
+                        return
                     entry_path = entry.path
                     if entry.is_dir(follow_symlinks=False):
                         # Enqueue directory
-                        self.tree_queue.put(('directory', entry_path, None, parent_node))
-                        logging.debug(f"Enqueued directory: {entry_path}")
+                        self.enqueue_tree(('directory', entry_path, None, parent_node))
+                        if debug:
+                            logger.debug(f"Enqueued directory: {entry_path}")
                         enqueued = True
                     elif entry.is_file(follow_symlinks=False):
-                        # Enqueue file without filtering
-                        self.tree_queue.put(('file', entry_path, None, parent_node))
-                        logging.debug(f"Enqueued file: {entry_path}")
+                        if not (self.show_all_files or is_text_name(entry.name)):
+                            continue  # Skip binary and other non-code files
+                        self.enqueue_tree(('file', entry_path, None, parent_node))
+                        if debug:
+                            logger.debug(f"Enqueued file: {entry_path}")
                         enqueued = True
         except PermissionError as e:
-            logging.error(f"Permission denied: {abspath} - {e}")
-            self.gui_queue.put(('log', f"Permission denied: {abspath}\n"))
+            logger.error(f"Permission denied: {abspath} - {e}")
+            self.enqueue_gui(('log', f"Permission denied: {abspath}\n"))
         except Exception as e:
-            logging.error(f"Error scanning {abspath}: {e}")
-            self.gui_queue.put(('log', f"Error scanning {abspath}: {e}\n"))
+            logger.error(f"Error scanning {abspath}: {e}")
+            self.enqueue_gui(('log', f"Error scanning {abspath}: {e}\n"))
+
+        if not enqueued:
+            # No eligible files or directories found
+            self.enqueue_gui(('log', f"No eligible files or directories found in: {abspath}\n"))
+
+    def scan_tree_bulk(self, root, root_node, cancel):
+        """
+        Scan a whole directory tree and enqueue every folder and file.
+        Runs in a separate thread and stops once cancel is set. Folder item ids are assigned here,
+        so their children can be queued before the folders themselves have been inserted.
+        """
+        pending = deque([(root, root_node)])  # Folders still to scan, with their Treeview item ids
+        enqueued = False
+        while pending:
+            dirpath, parent_node = pending.popleft()
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = sorted(it, key=lambda e: e.name.lower())
+            except PermissionError as e:
+                logger.error(f"Permission denied: {dirpath} - {e}")
+                self.enqueue_gui(('log', f"Permission denied: {dirpath}\n"))
+                continue
+            except Exception as e:
+                logger.error(f"Error scanning {dirpath}: {e}")
+                self.enqueue_gui(('log', f"Error scanning {dirpath}: {e}\n"))
+                continue
+
+            for entry in entries:
+                if cancel.is_set():
+                    logger.debug(f"Scanning stopped for: {root}")
+                    return
+                if entry.is_dir(follow_symlinks=False):
+                    node = f"scan{next(self.scan_ids)}"
+                    self.enqueue_tree(('scanned_directory', entry.path, node, parent_node))
+                    pending.append((entry.path, node))
+                    enqueued = True
+                elif entry.is_file(follow_symlinks=False):
+                    if not (self.show_all_files or is_text_name(entry.name)):
+                        continue  # Skip binary and other non-code files
+                    self.enqueue_tree(('file', entry.path, None, parent_node))
+                    enqueued = True
 
         if not enqueued:
             # No eligible files or directories found
-            self.gui_queue.put(('log', f"No eligible files or directories found in: {abspath}\n"))
+            self.enqueue_gui(('log', f"No eligible files or directories found in: {root}\n"))
 
     def reset_state(self):
         """Reset the application state to its initial configuration."""
         # Reset Treeview
-        self.tree.delete(*self.tree.get_children())
+        self.clear_tree()
 
         # Reset stats
         self.stats_labels['selected'].config(text="Selected Files: 0")
@@ -641,55 +956,397 @@ class CodebaseConverterApp:
         # Reset root_dir
         self.root_dir = None
 
-        logging.debug("Application state has been reset.")
+        logger.debug("Application state has been reset.")
 
-    def convert_code_to_pdf(self, source_file, dest_file):
-        """
-        Convert a source code file to a PDF with syntax highlighting.
-        Uses Pygments for highlighting and WeasyPrint for PDF generation.
-        """
+    def restart_app(self):
+        """Restart the application by resetting its state."""
+        confirm = messagebox.askyesno("Restart", "Are you sure you want to restart? All current selections and logs will be cleared.")
+        if confirm:
+            self.reset_state()
+            messagebox.showinfo("Restart", "The application has been restarted. Please select a new source folder.")
+
+
+def _fast_lexers():
+    """
+    Build the lexers for the most common extensions up front, one shared instance per lexer class.
+    These match what get_lexer_for_filename resolves for each extension.
+    """
+    lexers = {}
+    for lexer_class, extensions in (
+            (PythonLexer, ('.py', '.pyw')),
+            (JavascriptLexer, ('.js', '.mjs', '.cjs')),
+            (TypeScriptLexer, ('.ts',)),
+            (JavaLexer, ('.java',)),
+            (CLexer, ('.c', '.h')),
+            (CppLexer, ('.cpp', '.cc', '.cxx', '.hpp', '.hh', '.hxx')),
+            (GoLexer, ('.go',)),
+            (RustLexer, ('.rs',)),
+            (HtmlLexer, ('.html', '.htm')),
+            (CssLexer, ('.css',)),
+            (JsonLexer, ('.json',)),
+            (YamlLexer, ('.yml', '.yaml')),
+            (BashLexer, ('.sh', '.bash')),
+            (MarkdownLexer, ('.md',)),
+            (TextLexer, ('.txt',))):
+        lexer = lexer_class(stripall=True)
+        for ext in extensions:
+            lexers[ext] = lexer
+    return lexers
+
+
+# Extension -> shared lexer for common file types; other files go through _lexer_for
+_FAST_LEXERS = _fast_lexers()
+
+# File names Pygments matches exactly (e.g. 'CMakeLists.txt'), which the extension table must not shadow
+_NAMED_LEXER_FILES = frozenset(pattern for _, _, patterns, _ in get_all_lexers() for pattern in patterns
+                               if not any(c in pattern for c in '*?['))
+
+
+@lru_cache(maxsize=256)
+def _lexer_for(name):
+    """
+    Return a shared lexer for a lowercased file extension such as '.rb', or for a file name
+    Pygments matches exactly such as 'CMakeLists.txt' or 'Makefile'.
+    Resolving a lexer scans the Pygments registry, so the result is cached per key.
+    """
+    try:
+        return get_lexer_for_filename(name, stripall=True)
+    except Exception:
+        # Use a plain text lexer if no specific lexer is found
+        return TextLexer(stripall=True)
+
+
+def _read_source(source_file):
+    """
+    Read a source file as text.
+    The file is read in one large binary read and decoded as UTF-8, replacing invalid bytes.
+    """
+    try:
+        with open(source_file, 'rb', buffering=1024 * 1024) as f:
+            return f.read().decode('utf-8', errors='replace')
+    except Exception as e:
+        raise Exception(f"Failed to read {source_file}: {e}")
+
+
+def _lexer_for_file(source_file):
+    """Return the shared lexer for a source file."""
+    name = os.path.basename(source_file)
+    ext = os.path.splitext(name)[1].lower()
+    if not ext or name in _NAMED_LEXER_FILES:
+        return _lexer_for(name)
+    return _FAST_LEXERS.get(ext) or _lexer_for(ext)
+
+
+def _init_render_state():
+    """Create the font configuration and page stylesheet shared by every render in this process."""
+    global _FONT_CONFIG, _STYLESHEET
+    _FONT_CONFIG = FontConfiguration()
+    _STYLESHEET = CSS(string=_PAGE_CSS, font_config=_FONT_CONFIG)
+
+
+def _init_worker(render_slots=None, cancel_event=None):
+    """
+    Prepare a conversion worker process.
+    Used as the ProcessPoolExecutor initializer. System fonts are scanned on the worker's first
+    WeasyPrint render, so workers that only draw Fast PDFs or copy TXT files never load them.
+    render_slots is a semaphore shared by all workers that limits concurrent WeasyPrint layouts.
+    cancel_event is set when the conversion is stopped; batches check it between files.
+    """
+    global _RENDER_SLOTS, _CANCEL_EVENT
+    # Log straight to the file; the GUI process's queue listener does not serve workers
+    logging.basicConfig(level=LOG_LEVEL, filename=LOG_FILE, format=LOG_FORMAT, force=True)
+    if render_slots is not None:
+        _RENDER_SLOTS = render_slots
+    _CANCEL_EVENT = cancel_event
+
+
+def _conversion_cancelled():
+    """Return True if the conversion this worker belongs to has been stopped."""
+    return _CANCEL_EVENT is not None and _CANCEL_EVENT.is_set()
+
+
+def _stopped_error():
+    """Return the error recorded for a file that was skipped because the conversion was stopped."""
+    return Exception("Conversion stopped before the file was written")
+
+
+@contextmanager
+def _render_sources(source_files):
+    """
+    Highlight source files into one HTML document and lay it out with WeasyPrint.
+    Each file is wrapped in its own section, starting on a new page. The highlighted HTML is
+    streamed into a buffer, or into a temporary file when the sources are large.
+    Highlighting runs in every worker at once, but the layout and the PDF writing done in the
+    with block hold a render slot, which bounds how many large documents are in memory.
+    Yields (document, rendered, errors): the laid-out document (None if no file could be read),
+    the files it contains in order, and a dict mapping each unreadable file to its error.
+    """
+    errors = {}
+    rendered = []
+
+    total_size = 0
+    for source_file in source_files:
         try:
-            with open(source_file, 'r', encoding='utf-8') as f:
-                code = f.read()
-        except Exception as e:
-            raise Exception(f"Failed to read {source_file}: {e}")
+            total_size += os.path.getsize(source_file)
+        except OSError:
+            pass  # Reported when the file is read
+    spool = total_size > HTML_SPOOL_THRESHOLD
+    if spool:
+        out = tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.html', delete=False)
+    else:
+        out = io.StringIO()
+
+    try:
+        with out:
+            out.write(_HTML_HEAD)
+            for source_file in source_files:
+                try:
+                    code = _read_source(source_file)
+                except Exception as e:
+                    errors[source_file] = e
+                    continue
+                out.write(f'<section class="source-file" id="source-file-{len(rendered)}">')
+                _FORMATTER.format(_lexer_for_file(source_file).get_tokens(code), out)
+                out.write('</section>\n')
+                rendered.append(source_file)
+            out.write(_HTML_TAIL)
+            html = None if spool else out.getvalue()
+
+        if not rendered:
+            yield None, rendered, errors
+            return
+        if _FONT_CONFIG is None:
+            _init_render_state()  # First WeasyPrint render in this process
+
+        with _RENDER_SLOTS:
+            try:
+                if spool:
+                    source = HTML(filename=out.name, encoding='utf-8')
+                else:
+                    source = HTML(string=html)
+                document = source.render(stylesheets=[_STYLESHEET], font_config=_FONT_CONFIG)
+            except Exception as e:
+                raise Exception(f"Failed to render PDF: {e}")
+            yield document, rendered, errors
+    finally:
+        if spool:
+            os.remove(out.name)
+
 
+def convert_code_to_pdf(source_file, dest_file):
+    """
+    Convert a source code file to a PDF with syntax highlighting.
+    Uses Pygments for highlighting and WeasyPrint for PDF generation.
+    """
+    with _render_sources([source_file]) as (document, _, errors):
+        if source_file in errors:
+            raise errors[source_file]
+
+        # Write the laid-out document to PDF
         try:
-            lexer = get_lexer_for_filename(source_file, stripall=True)
-        except Exception:
-            # Use a plain text lexer if no specific lexer is found
-            lexer = TextLexer(stripall=True)
-
-        # Custom CSS for line wrapping and page margins
-        custom_css = '''
-        @page {
-            size: A4;
-            margin: 1cm;
-        }
-        pre, code {
-            white-space: pre-wrap;       /* Wrap long lines */
-            word-wrap: break-word;       /* Break words if necessary */
-            word-break: break-all;       /* Break long words/chunks */
-        }
-        '''
-
-        formatter = HtmlFormatter(full=True, style='colorful', cssstyles=custom_css)
-        highlighted_code = highlight(code, lexer, formatter)
-
-        # Convert the highlighted HTML to PDF
+            document.write_pdf(dest_file)
+            logger.debug(f"Successfully converted {source_file} to {dest_file}")
+        except Exception as e:
+            raise Exception(f"Failed to write PDF {dest_file}: {e}")
+
+
+@lru_cache(maxsize=None)
+def _fast_pdf_font(fontname):
+    """Return a shared PyMuPDF font object for a built-in font name."""
+    return pymupdf.Font(fontname)
+
+
+@lru_cache(maxsize=None)
+def _fast_pdf_style(ttype):
+    """Return the (PDF font name, RGB color) used for a Pygments token type in fast PDFs."""
+    style = _FORMATTER.style.style_for_token(ttype)
+    color = style['color'] or '000000'
+    rgb = tuple(int(color[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    return ('cobo' if style['bold'] else 'cour'), rgb  # Courier-Bold / Courier
+
+
+def _write_fast_pdf_page(page, writers):
+    """Draw the text collected for a fast PDF page, one TextWriter per color."""
+    for writer in writers.values():
+        writer.write_text(page)
+    writers.clear()
+
+
+def convert_code_to_pdf_fast(source_file, dest_file):
+    """
+    Convert a source code file to a PDF by drawing the highlighted tokens directly with PyMuPDF.
+    Skips HTML/CSS layout entirely, at the cost of using the built-in Courier font (Latin
+    characters only) and simple wrapping of long lines at a fixed column.
+    """
+    code = _read_source(source_file).expandtabs(4)
+    lexer = _lexer_for_file(source_file)
+
+    page_width, page_height = pymupdf.paper_size('a4')
+    char_width = FAST_PDF_FONT_SIZE * 0.6  # Courier advance width
+    line_height = FAST_PDF_FONT_SIZE * 1.2
+    max_columns = int((page_width - 2 * FAST_PDF_MARGIN) // char_width)
+    max_rows = int((page_height - 2 * FAST_PDF_MARGIN) // line_height)
+
+    doc = pymupdf.open()
+    try:
+        page = None
+        writers = {}  # color -> TextWriter for the current page
+        row = 0
+        column = 0
+        for ttype, value in lexer.get_tokens(code):
+            fontname, color = _fast_pdf_style(ttype)
+            for line_number, text in enumerate(value.split('\n')):
+                if line_number:
+                    row += 1
+                    column = 0
+                while text:
+                    if column >= max_columns:
+                        # Wrap long lines
+                        row += 1
+                        column = 0
+                    if page is None:
+                        page = doc.new_page(width=page_width, height=page_height)
+                    while row >= max_rows:
+                        # Carry rows past the end of the page (e.g. blank lines) over to the next one
+                        _write_fast_pdf_page(page, writers)
+                        page = doc.new_page(width=page_width, height=page_height)
+                        row -= max_rows
+                    run = text[:max_columns - column]
+                    text = text[len(run):]
+                    if not run.isspace():
+                        if color not in writers:
+                            writers[color] = pymupdf.TextWriter(page.rect, color=color)
+                        writers[color].append((FAST_PDF_MARGIN + column * char_width,
+                                               FAST_PDF_MARGIN + row * line_height + FAST_PDF_FONT_SIZE),
+                                              run, font=_fast_pdf_font(fontname), fontsize=FAST_PDF_FONT_SIZE)
+                    column += len(run)
+
+        if page is None:
+            doc.new_page(width=page_width, height=page_height)  # Empty source file
+        else:
+            _write_fast_pdf_page(page, writers)
+
         try:
-            HTML(string=highlighted_code).write_pdf(dest_file)
-            logging.debug(f"Successfully converted {source_file} to {dest_file}")
+            doc.save(dest_file, garbage=3, deflate=True)
+            logger.debug(f"Successfully converted {source_file} to {dest_file}")
         except Exception as e:
             raise Exception(f"Failed to write PDF {dest_file}: {e}")
+    finally:
+        doc.close()
 
 
-    def restart_app(self):
-        """Restart the application by resetting its state."""
-        confirm = messagebox.askyesno("Restart", "Are you sure you want to restart? All current selections and logs will be cleared.")
-        if confirm:
-            self.reset_state()
-            messagebox.showinfo("Restart", "The application has been restarted. Please select a new source folder.")
+def _render_batch(files, dest_paths):
+    """
+    Convert several source files to PDF with a single WeasyPrint layout pass.
+    Each file starts on a new page of one combined document, which is then split back into
+    one PDF per file. Returns a dict mapping each failed or skipped source file to its error.
+    """
+    if _conversion_cancelled():
+        return {source_file: _stopped_error() for source_file in files}
+    try:
+        with _render_sources(files) as (document, rendered, errors):
+            if document is not None:
+                _split_document(document, rendered, dict(zip(files, dest_paths)), errors)
+        return errors
+    except Exception:
+        # Fall back to one document per file so a single bad file does not fail the batch
+        errors = {}
+        for source_file, dest_file in zip(files, dest_paths):
+            if _conversion_cancelled():
+                errors[source_file] = _stopped_error()
+                continue
+            try:
+                convert_code_to_pdf(source_file, dest_file)
+            except Exception as e:
+                errors[source_file] = e
+        return errors
+
+
+def _split_document(document, rendered, dest_by_file, errors):
+    """
+    Write each file's pages of a combined document to its own PDF, recording failures in errors.
+    Files not yet written when the conversion is stopped are recorded as skipped.
+    """
+    # Find the first page of every file from the section anchors
+    start_pages = {}
+    for page_number, page in enumerate(document.pages):
+        for anchor in page.anchors:
+            if anchor.startswith('source-file-'):
+                start_pages.setdefault(int(anchor[len('source-file-'):]), page_number)
+
+    for index, source_file in enumerate(rendered):
+        if _conversion_cancelled():
+            errors[source_file] = _stopped_error()
+            continue
+        dest_file = dest_by_file[source_file]
+        try:
+            first_page = start_pages[index]
+            last_page = start_pages.get(index + 1, len(document.pages))
+            document.copy(document.pages[first_page:last_page]).write_pdf(dest_file)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Successfully converted {source_file} to {dest_file}")
+        except Exception as e:
+            errors[source_file] = Exception(f"Failed to write PDF {dest_file}: {e}")
+
+
+def _convert_batch(jobs, formats, fast_pdf=False):
+    """
+    Convert a batch of (source_file, dest_base) jobs to the requested formats.
+    dest_base is the destination path without extension; its directory must already exist.
+    With fast_pdf, PDFs are drawn with PyMuPDF instead of being rendered by WeasyPrint.
+    Runs in a worker process. Returns a list of (source_file, ok_pdf, ok_txt, messages) tuples,
+    where ok_pdf/ok_txt are None for formats that were not requested.
+    Once the conversion is stopped, the remaining files are skipped and reported as failed.
+    """
+    pdf_errors = {}
+    if 'pdf' in formats and fast_pdf:
+        for source_file, dest_base in jobs:
+            if _conversion_cancelled():
+                pdf_errors[source_file] = _stopped_error()
+                continue
+            try:
+                convert_code_to_pdf_fast(source_file, dest_base + '.pdf')
+            except Exception as e:
+                pdf_errors[source_file] = e
+    elif 'pdf' in formats:
+        pdf_errors = _render_batch([source_file for source_file, _ in jobs],
+                                   [dest_base + '.pdf' for _, dest_base in jobs])
+
+    results = []
+    for source_file, dest_base in jobs:
+        ok_pdf = None
+        ok_txt = None
+        messages = []
+
+        if 'pdf' in formats:
+            dest_pdf = dest_base + '.pdf'
+            if source_file in pdf_errors:
+                ok_pdf = False
+                messages.append(f"Failed to convert {source_file} to PDF: {pdf_errors[source_file]}\n")
+            else:
+                ok_pdf = True
+                messages.append(f"Converted to PDF: {dest_pdf}\n")
+
+        if 'txt' in formats:
+            try:
+                if _conversion_cancelled():
+                    raise _stopped_error()
+                dest_txt = dest_base + '.txt'
+                shutil.copyfile(source_file, dest_txt)  # Byte-for-byte copy, no decode/encode round-trip
+                ok_txt = True
+                messages.append(f"Converted to TXT: {dest_txt}\n")
+            except Exception as e:
+                ok_txt = False
+                messages.append(f"Failed to convert {source_file} to TXT: {e}\n")
+
+        results.append((source_file, ok_pdf, ok_txt, messages))
+    return results
+
+
+def is_text_name(filename):
+    """Check if a file name has a known code or text file extension (or is a well-known text file)."""
+    name = filename.lower()
+    return os.path.splitext(name)[1] in TEXT_EXTS or name in TEXT_FILENAMES
 
 
 def is_text_file(file_path):
@@ -703,18 +1360,35 @@ def is_text_file(file_path):
         return mime.startswith('text')
     else:
         # Fallback: Check for common text and code file extensions
-        text_extensions = [
-            '.py', '.txt', '.md', '.java', '.c', '.cpp', '.js', '.html', '.css',
-            '.json', '.xml', '.sh', '.bat', '.ini', '.rb', '.go', '.rs', '.swift',
-            '.kt', '.ts', '.php', '.pl', '.scala', '.hs', '.lua', '.r', '.sql'
-        ]
-        return os.path.splitext(file_path)[1].lower() in text_extensions
-    
+        return is_text_name(os.path.basename(file_path))
+
+
+def configure_logging():
+    """
+    Send log records to LOG_FILE through a background listener thread, so that writing the
+    log file never blocks the GUI or scan threads. Returns the listener to stop on exit.
+    """
+    log_queue = queue.Queue()
+    file_handler = logging.FileHandler(LOG_FILE)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, file_handler)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(LOG_LEVEL)
+    root_logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
+
+
 def main():
     """Initialize and run the application."""
-    root = tk.Tk()
-    app = CodebaseConverterApp(root)
-    root.mainloop()
+    listener = configure_logging()
+    try:
+        root = tk.Tk()
+        app = CodebaseConverterApp(root)
+        root.mainloop()
+    finally:
+        listener.stop()  # Flush remaining log records
 
 
 if __name__ == '__main__':